@@ -1,9 +1,13 @@
 """Algorithms package for portfolio optimization and decision making."""
 
+from .portfolio_risk import PortfolioRisk
 from .regime_detection import RegimeDetection
+from .rl_agent import RLAgent
 from .sector_allocation import SectorAllocation
 
 __all__ = [
+    'PortfolioRisk',
     'RegimeDetection',
+    'RLAgent',
     'SectorAllocation',
 ]
@@ -1,7 +1,30 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Média móvel via somas acumuladas, sem o wrapper pd.Series.
+
+    Equivalente a pd.Series(x).rolling(window).mean().values (NaN nas
+    primeiras window-1 posições), mas opera direto no ndarray: uma
+    passada de cumsum em vez de construir Series + BlockManager por
+    chamada.
+    """
+    out = np.full(x.shape[0], np.nan)
+    c = np.cumsum(x)
+    out[window - 1] = c[window - 1] / window
+    out[window:] = (c[window:] - c[:-window]) / window
+    return out
+
+
+def _rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Desvio padrão móvel (ddof=1) sobre janelas deslizantes do ndarray."""
+    out = np.full(x.shape[0], np.nan)
+    if x.shape[0] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(x, window)
+        out[window - 1:] = windows.std(axis=1, ddof=1)
+    return out
 
 
 class RegimeDetection:
@@ -46,14 +69,16 @@ class RegimeDetection:
         self.current_regime = None
         self.regime_strength = 0.0
     
-    def detect_regime(self, price_data: pd.DataFrame, 
-                     macro_data: Optional[pd.DataFrame] = None) -> Dict:
+    def detect_regime(self, price_data: pd.DataFrame,
+                     macro_data: Optional[Union[pd.DataFrame, Mapping[str, float]]] = None) -> Dict:
         """Detecta o regime atual de mercado.
-        
+
         Args:
             price_data: DataFrame com histórico de preços (close)
-            macro_data: DataFrame com indicadores macro (SELIC, IPCA, PIB)
-            
+            macro_data: Indicadores macro (SELIC, IPCA, PIB) - aceita um dict
+                simples ou DataFrame; o dict evita o custo de construção do
+                DataFrame no caminho em tempo real
+
         Returns:
             Dict com regime, força e indicadores
         """
@@ -87,7 +112,7 @@ class RegimeDetection:
             'trend': trend,
             'rsi': rsi[-1],
             'volatility': volatility[-1],
-            'momentum': momentum[-1],
+            'momentum': momentum,
             'mas': {
                 'short': mas['short'][-1],
                 'medium': mas['medium'][-1],
@@ -97,9 +122,9 @@ class RegimeDetection:
     
     def _calculate_mas(self, close: np.ndarray) -> Dict:
         """Calcula médias móveis."""
-        ma_short = pd.Series(close).rolling(window=self.window_short).mean().values
-        ma_medium = pd.Series(close).rolling(window=self.window_medium).mean().values
-        ma_long = pd.Series(close).rolling(window=self.window_long).mean().values
+        ma_short = _rolling_mean(close, self.window_short)
+        ma_medium = _rolling_mean(close, self.window_medium)
+        ma_long = _rolling_mean(close, self.window_long)
         
         return {
             'short': ma_short,
@@ -134,7 +159,7 @@ class RegimeDetection:
     def _calculate_volatility(self, close: np.ndarray) -> np.ndarray:
         """Calcula volatilidade (desvio padrão dos retornos)."""
         returns = np.diff(np.log(close))
-        volatility = pd.Series(returns).rolling(window=self.volatility_window).std().values
+        volatility = _rolling_std(returns, self.volatility_window)
         volatility = np.insert(volatility, 0, [0] * (len(close) - len(volatility)))
         return volatility * 100  # Percentual
     
@@ -175,9 +200,9 @@ class RegimeDetection:
             return 0.0
         return (close[-1] - close[-window-1]) / close[-window-1]
     
-    def _identify_regime(self, trend: float, rsi: np.ndarray, 
+    def _identify_regime(self, trend: float, rsi: np.ndarray,
                         volatility: np.ndarray, momentum: float,
-                        macro_data: Optional[pd.DataFrame] = None) -> Tuple[str, float]:
+                        macro_data: Optional[Union[pd.DataFrame, Mapping[str, float]]] = None) -> Tuple[str, float]:
         """Identifica regime baseado em indicadores."""
         
         rsi_current = rsi[-1]
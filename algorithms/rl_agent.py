@@ -0,0 +1,339 @@
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # numba é opcional - fallback para o loop interpretado
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def _replay_update(q_table: np.ndarray, s_idx: np.ndarray, n_idx: np.ndarray,
+                   actions: np.ndarray, rewards: np.ndarray, dones: np.ndarray,
+                   gamma: float, lr: float):
+    """Atualização de Bellman sobre o minibatch, compilada para código nativo.
+
+    Loop escalar sequencial: preserva a semântica quando o mesmo par
+    (estado, ação) se repete no lote e evita os temporários da versão
+    NumPy (target, delta) a cada replay.
+    """
+    for i in range(len(actions)):
+        best_next = q_table[n_idx[i]].max()
+        target = rewards[i] if dones[i] else rewards[i] + gamma * best_next
+        q_table[s_idx[i], actions[i]] += lr * (target - q_table[s_idx[i], actions[i]])
+
+
+@njit(cache=True)
+def _discretize_kernel(x: np.ndarray, state_size: int) -> np.ndarray:
+    """Discretiza um lote de valores em [-1, 1] para bins da Q-table."""
+    out = np.empty(x.shape[0], dtype=np.int64)
+    half = state_size * 0.5
+    for i in range(x.shape[0]):
+        v = x[i]
+        if v < -1.0:
+            v = -1.0
+        elif v > 1.0:
+            v = 1.0
+        idx = int((v + 1.0) * half)
+        if idx < 0:
+            idx = 0
+        elif idx >= state_size:
+            idx = state_size - 1
+        out[i] = idx
+    return out
+
+
+# Warm-compile no import para não pagar o custo do JIT no primeiro replay
+_discretize_kernel(np.zeros(1), 2)
+_replay_update(np.zeros((2, 2)), np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64),
+               np.zeros(1, dtype=np.int32), np.zeros(1, dtype=np.float32),
+               np.zeros(1, dtype=np.bool_), 0.95, 0.1)
+
+# Kernel de replay especializado por assinatura concreta (compilado uma vez)
+_REPLAY_SPECIALIZED = None
+
+
+def _specialized_replay_kernel():
+    """Compila eagerly o kernel de replay para a assinatura exata dos buffers.
+
+    Com os tipos e a contiguidade C declarados (em vez do dispatch lazy
+    genérico), o LLVM pode assumir strides unitários e gerar código mais
+    denso no caminho quente. Compila uma única vez por processo; sem
+    numba, devolve o loop interpretado.
+    """
+    global _REPLAY_SPECIALIZED
+    if _REPLAY_SPECIALIZED is None:
+        if _HAS_NUMBA:
+            from numba import boolean, float32, float64, int32, int64, void
+            sig = void(float64[:, ::1], int64[::1], int64[::1], int32[::1],
+                       float32[::1], boolean[::1], float64, float64)
+            _REPLAY_SPECIALIZED = njit(sig, cache=True, fastmath=True)(
+                _replay_update.py_func)
+        else:
+            _REPLAY_SPECIALIZED = _replay_update
+    return _REPLAY_SPECIALIZED
+
+
+class RLAgent:
+    """Agente de Q-learning tabular para a camada MICRO.
+
+    Aprende a concentrar o aporte em um setor favorecido a partir de um
+    estado de mercado resumido (tendência normalizada em [-1, 1]),
+    complementando a alocação por regime. Os perfis em config/profiles.py
+    definem os parâmetros de treino (reward_metric, risk_penalty_factor).
+    """
+
+    __slots__ = ('state_size', 'action_size', 'learning_rate', 'gamma',
+                 'epsilon', 'epsilon_min', 'epsilon_decay', 'q_table', '_rng',
+                 'memory_size', 'state_dim', 'mmap_dir', '_states',
+                 '_next_states', '_actions', '_rewards', '_dones', '_cursor',
+                 '_size', '_alloc_hi', '_alloc_lo', '_replay_kernel',
+                 'quantize_table', 'q_table_q8', 'q_row_scale',
+                 '_sector_keys', '_alloc_template')
+
+    def __init__(self,
+                 state_size: int = 20,
+                 action_size: int = 5,
+                 learning_rate: float = 0.1,
+                 gamma: float = 0.95,
+                 epsilon: float = 1.0,
+                 epsilon_min: float = 0.01,
+                 epsilon_decay: float = 0.995,
+                 memory_size: int = 2000,
+                 state_dim: int = 1,
+                 memory_backing: str = 'ram',
+                 mmap_dir: Optional[str] = None,
+                 seed: Optional[int] = None,
+                 quantize_table: bool = False):
+        """Inicializa o agente.
+
+        Args:
+            state_size: Número de bins de discretização do estado
+            action_size: Número de ações (setores disponíveis)
+            learning_rate: Taxa de aprendizado da atualização de Bellman
+            gamma: Fator de desconto
+            epsilon: Taxa inicial de exploração
+            epsilon_min: Taxa mínima de exploração
+            epsilon_decay: Decaimento de epsilon por replay
+            memory_size: Capacidade do replay buffer
+            state_dim: Dimensão do vetor de estado armazenado no buffer
+            memory_backing: 'ram' (padrão) ou 'mmap' - buffers grandes
+                podem viver em disco via np.memmap, deixando o SO paginar
+                em vez de manter tudo residente na heap
+            mmap_dir: Diretório dos arquivos memmap (temporário se None)
+            seed: Semente do gerador de números aleatórios (reprodutível)
+            quantize_table: Mantém uma cópia int8 da Q-table para a
+                inferência (act) - 8x menos banda de memória no argmax,
+                relevante para espaços de estado grandes
+        """
+        self.state_size = state_size
+        self.action_size = action_size
+        self.learning_rate = learning_rate
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.epsilon_min = epsilon_min
+        self.epsilon_decay = epsilon_decay
+        self.q_table = np.zeros((state_size, action_size))
+        # Generator moderno (PCG64): mais rápido que o RandomState legado
+        # do módulo np.random e permite treinos reprodutíveis via seed
+        self._rng = np.random.default_rng(seed)
+
+        # Replay buffer Struct-of-Arrays: arrays paralelos pré-alocados com
+        # cursor circular, em vez de deque de tuplas Python. Escrita O(1)
+        # sem alocação por passo e amostragem por fancy indexing direto.
+        self.memory_size = memory_size
+        self.state_dim = state_dim
+
+        if memory_backing == 'mmap':
+            self.mmap_dir = mmap_dir or tempfile.mkdtemp(prefix='rl_replay_')
+            os.makedirs(self.mmap_dir, exist_ok=True)
+
+            def _alloc(name, dtype, shape):
+                path = os.path.join(self.mmap_dir, f'{name}.dat')
+                return np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+        else:
+            self.mmap_dir = None
+
+            def _alloc(name, dtype, shape):
+                return np.zeros(shape, dtype=dtype)
+
+        self._states = _alloc('states', np.float32, (memory_size, state_dim))
+        self._next_states = _alloc('next_states', np.float32, (memory_size, state_dim))
+        self._actions = _alloc('actions', np.int32, memory_size)
+        self._rewards = _alloc('rewards', np.float32, memory_size)
+        self._dones = _alloc('dones', bool, memory_size)
+        self._cursor = 0
+        self._size = 0
+
+        # Pesos já normalizados do mapeamento ação->alocação: o setor
+        # favorecido recebe 1.5 e os demais 0.875, então a soma é fixa
+        # e a divisão por total sai do hot-path
+        total = 1.5 + (action_size - 1) * 0.875
+        self._alloc_hi = 1.5 / total
+        self._alloc_lo = 0.875 / total
+        # Chaves e template reutilizados - sem f-strings por chamada
+        self._sector_keys = tuple(f'sector_{i}' for i in range(action_size))
+        self._alloc_template = [self._alloc_lo] * action_size
+
+        # Variante do kernel de replay com assinatura concreta dos buffers
+        self._replay_kernel = _specialized_replay_kernel()
+
+        # Q-table quantizada para inferência: int8 com escala por linha.
+        # O argmax é invariante a uma escala positiva por linha, então a
+        # ação greedy sai da cópia int8; os updates de Bellman continuam
+        # na tabela float (sombra) e as linhas tocadas são requantizadas
+        self.quantize_table = quantize_table
+        if quantize_table:
+            self.q_table_q8 = np.zeros((state_size, action_size), dtype=np.int8)
+            self.q_row_scale = np.ones(state_size, dtype=np.float32)
+        else:
+            self.q_table_q8 = None
+            self.q_row_scale = None
+
+    def _discretize_state(self, state) -> int:
+        """Mapeia o estado contínuo ([-1, 1]) para um bin da Q-table."""
+        # Aritmética escalar pura com branches - sem os arrays temporários
+        # de 1 elemento que np.clip criaria para um único valor
+        x = float(state[0]) if np.ndim(state) > 0 else float(state)
+        if x < -1.0:
+            x = -1.0
+        elif x > 1.0:
+            x = 1.0
+        idx = int((x + 1.0) * (self.state_size * 0.5))
+        if idx < 0:
+            return 0
+        if idx >= self.state_size:
+            return self.state_size - 1
+        return idx
+
+    def _discretize_batch(self, states: np.ndarray) -> np.ndarray:
+        """Versão em lote de _discretize_state (kernel JIT)."""
+        x = states[:, 0] if states.ndim == 2 else states
+        return _discretize_kernel(np.ascontiguousarray(x, dtype=np.float64),
+                                  self.state_size)
+
+    def remember(self, state, action: int, reward: float, next_state, done: bool):
+        """Armazena uma transição no replay buffer."""
+        i = self._cursor
+        self._states[i] = state
+        self._actions[i] = action
+        self._rewards[i] = reward
+        self._next_states[i] = next_state
+        self._dones[i] = done
+        self._cursor = (i + 1) % self.memory_size
+        self._size = min(self._size + 1, self.memory_size)
+
+    def act(self, state) -> int:
+        """Seleciona ação via epsilon-greedy."""
+        return int(self.act_batch(np.atleast_1d(np.asarray(state, dtype=np.float64))[None])[0])
+
+    def act_batch(self, states: np.ndarray) -> np.ndarray:
+        """Epsilon-greedy vetorizado para um lote de m estados.
+
+        Um kernel NumPy decide as m ações de uma vez: máscara de
+        exploração, ações aleatórias e argmax em lote sobre a Q-table,
+        em vez de m chamadas Python individuais.
+        """
+        m = states.shape[0]
+        table = self.q_table_q8 if self.quantize_table else self.q_table
+        greedy = table[self._discretize_batch(states)].argmax(axis=1)
+        explore = self._rng.random(m) < self.epsilon
+        random_actions = self._rng.integers(0, self.action_size, size=m)
+        return np.where(explore, random_actions, greedy)
+
+    def replay(self, batch_size: int = 32):
+        """Treina com um minibatch do replay buffer.
+
+        O lote inteiro é atualizado pelo kernel JIT _replay_update (um
+        loop nativo, sem temporários), preservando a semântica sequencial
+        quando o mesmo par (estado, ação) se repete no lote.
+        """
+        if self._size < batch_size:
+            return
+
+        idx = self._rng.integers(0, self._size, size=batch_size)
+
+        s_idx = self._discretize_batch(self._states[idx])
+        n_idx = self._discretize_batch(self._next_states[idx])
+        self._replay_kernel(self.q_table, s_idx, n_idx, self._actions[idx],
+                            self._rewards[idx], self._dones[idx],
+                            self.gamma, self.learning_rate)
+        if self.quantize_table:
+            self._requantize_rows(np.unique(s_idx))
+
+        if self.epsilon > self.epsilon_min:
+            self.epsilon *= self.epsilon_decay
+
+    def _requantize_rows(self, rows: np.ndarray):
+        """Requantiza as linhas da Q-table tocadas pelo último replay."""
+        sub = self.q_table[rows]
+        scale = np.abs(sub).max(axis=1) / 127.0
+        scale[scale == 0.0] = 1.0
+        self.q_row_scale[rows] = scale
+        self.q_table_q8[rows] = np.rint(sub / scale[:, None]).astype(np.int8)
+
+    def train_vec(self, vec_env, steps: int, batch_size: int = 32):
+        """Treina com m ambientes paralelos avançando em lockstep.
+
+        Em vez de episódios estritamente sequenciais, cada passo de
+        relógio produz m transições (uma por ambiente) acumuladas no
+        replay buffer, seguidas de um replay - o protocolo clássico de
+        ambientes vetorizados.
+
+        Args:
+            vec_env: Ambiente vetorizado com reset() -> (m, state_dim) e
+                step(actions) -> (next_states, rewards, dones)
+            steps: Número de passos de lockstep
+            batch_size: Tamanho do minibatch de replay por passo
+        """
+        states = np.atleast_2d(np.asarray(vec_env.reset(), dtype=np.float32))
+        m = states.shape[0]
+
+        for _ in range(steps):
+            actions = self.act_batch(states)
+            next_states, rewards, dones = vec_env.step(actions)
+            next_states = np.atleast_2d(np.asarray(next_states, dtype=np.float32))
+
+            for j in range(m):
+                self.remember(states[j], int(actions[j]), float(rewards[j]),
+                              next_states[j], bool(dones[j]))
+
+            self.replay(batch_size)
+            states = next_states
+
+    def _action_to_allocation(self, action: int) -> Dict[str, float]:
+        """Converte a ação (setor favorecido) em pesos normalizados."""
+        # Escreve o peso favorecido no template, monta o dict e restaura -
+        # nenhuma string formatada nem lista nova por chamada
+        favored = action % self.action_size
+        template = self._alloc_template
+        template[favored] = self._alloc_hi
+        allocation = dict(zip(self._sector_keys, template))
+        template[favored] = self._alloc_lo
+        return allocation
+
+
+if __name__ == "__main__":
+    # Teste rápido
+    agent = RLAgent()
+    print(f"RLAgent criado com sucesso!")
+
+    rng = np.random.default_rng(42)
+    state = np.array([0.3])
+    for _ in range(64):
+        action = agent.act(state)
+        next_state = np.array([np.clip(state[0] + rng.standard_normal() * 0.1, -1, 1)])
+        agent.remember(state, action, rng.standard_normal(), next_state, False)
+        state = next_state
+    agent.replay(32)
+    print(f"Q-table shape: {agent.q_table.shape}, epsilon: {agent.epsilon:.3f}")
+    print(f"Alocacao da acao 2: {agent._action_to_allocation(2)}")
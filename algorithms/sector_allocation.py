@@ -3,6 +3,35 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # numba é opcional - fallback puro NumPy
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def _scale_and_normalize(weights: np.ndarray, mult: np.ndarray) -> np.ndarray:
+    """Núcleo numérico da alocação: aplica multiplicadores de regime e renormaliza.
+
+    Compilado com numba (quando disponível) para virar código de máquina;
+    chamado milhares de vezes em agentes de longa duração.
+    """
+    out = weights * mult
+    total = out.sum()
+    if total > 0:
+        out = out / total
+    return out
+
+
+# Warm-compile no import para não pagar o custo do JIT no hot-path
+_scale_and_normalize(np.ones(5), np.ones(5))
+
 
 @dataclass
 class SectorWeights:
@@ -49,6 +78,18 @@ class SectorAllocation:
     TECHNOLOGY = 'technology'
     IA = 'ia'
     AGRICULTURE = 'agriculture'
+
+    # Ordem canônica dos setores nos vetores numéricos
+    SECTOR_ORDER = (ENERGY, REAL_ESTATE, TECHNOLOGY, IA, AGRICULTURE)
+
+    # Camada MEGA: percentuais por regime (ordem: RF, FIIs, Ações)
+    MEGA_ORDER = ('fixed_income', 'fiis', 'stocks')
+    MEGA_PCT = {
+        'bull': np.array([0.15, 0.20, 0.65]),
+        'bear': np.array([0.50, 0.25, 0.25]),
+        'sideways': np.array([0.30, 0.30, 0.40]),
+        'transition': np.array([0.40, 0.25, 0.35]),
+    }
     
     # Perfis de investidor
     CONSERVATIVE = 'conservative'
@@ -96,92 +137,94 @@ class SectorAllocation:
             )
         
         self.sector_weights.normalize()
-    
-    def allocate_by_regime(self, regime: str, regime_strength: float) -> Dict[str, float]:
-        """Aloca setores conforme regime de mercado.
-        
-        Args:
-            regime: Regime detectado (bull, bear, sideways, transition)
-            regime_strength: Força do regime (0-1)
-            
-        Returns:
-            Dict com pesos atualizados para cada setor
-        """
-        weights = SectorWeights(
-            energy=self.sector_weights.energy,
-            real_estate=self.sector_weights.real_estate,
-            technology=self.sector_weights.technology,
-            ia=self.sector_weights.ia,
-            agriculture=self.sector_weights.agriculture,
-        )
-        
+
+        # Vetor base na ordem canônica - reutilizado em todas as alocações
+        self._base_w = np.array([
+            self.sector_weights.energy,
+            self.sector_weights.real_estate,
+            self.sector_weights.technology,
+            self.sector_weights.ia,
+            self.sector_weights.agriculture,
+        ])
+
+    def _regime_multipliers(self, regime: str, regime_strength: float) -> np.ndarray:
+        """Multiplicadores por setor para o regime (ordem SECTOR_ORDER)."""
         if regime == 'bull':
             # Regime altista: aumentar tech e IA
-            weights.technology *= (1 + 0.3 * regime_strength)
-            weights.ia *= (1 + 0.4 * regime_strength)
-            weights.energy *= (1 - 0.1 * regime_strength)
-            weights.real_estate *= (1 - 0.1 * regime_strength)
-        
+            mult = np.array([
+                1 - 0.1 * regime_strength,
+                1 - 0.1 * regime_strength,
+                1 + 0.3 * regime_strength,
+                1 + 0.4 * regime_strength,
+                1.0,
+            ])
+
         elif regime == 'bear':
             # Regime baixista: defensivo - energia e imóveis
-            weights.energy *= (1 + 0.2 * regime_strength)
-            weights.real_estate *= (1 + 0.2 * regime_strength)
-            weights.agriculture *= (1 + 0.1 * regime_strength)
-            weights.technology *= (1 - 0.2 * regime_strength)
-            weights.ia *= (1 - 0.3 * regime_strength)
-        
+            mult = np.array([
+                1 + 0.2 * regime_strength,
+                1 + 0.2 * regime_strength,
+                1 - 0.2 * regime_strength,
+                1 - 0.3 * regime_strength,
+                1 + 0.1 * regime_strength,
+            ])
+
         elif regime == 'sideways':
             # Mercado lateral: manter equilíbrio
-            pass  # Manter pesos base
-        
+            mult = np.ones(5)
+
         else:  # transition
             # Transição: reduzir risco geral
-            weights.energy *= 1.1
-            weights.real_estate *= 1.1
-            weights.technology *= 0.9
-            weights.ia *= 0.85
-        
-        weights.normalize()
-        return weights.to_dict()
-    
+            mult = np.array([1.1, 1.1, 0.9, 0.85, 1.0])
+
+        return mult
+
+    def allocate_by_regime(self, regime: str, regime_strength: float) -> Dict[str, float]:
+        """Aloca setores conforme regime de mercado.
+
+        Args:
+            regime: Regime detectado (bull, bear, sideways, transition)
+            regime_strength: Força do regime (0-1)
+
+        Returns:
+            Dict com pesos atualizados para cada setor
+        """
+        mult = self._regime_multipliers(regime, regime_strength)
+        adjusted = _scale_and_normalize(self._base_w, mult)
+        return dict(zip(self.SECTOR_ORDER, adjusted.tolist()))
+
     def allocate_mega_layer(self, regime: str, regime_strength: float) -> Dict[str, float]:
         """Aloca camada MEGA: RF, FIIs, Ações.
-        
+
         Returns:
             Pesos para fixed_income, fiis, stocks
         """
-        if regime == 'bull':
-            return {
-                'fixed_income': 0.15,
-                'fiis': 0.20,
-                'stocks': 0.65,
-            }
-        elif regime == 'bear':
-            return {
-                'fixed_income': 0.50,
-                'fiis': 0.25,
-                'stocks': 0.25,
-            }
-        elif regime == 'sideways':
-            return {
-                'fixed_income': 0.30,
-                'fiis': 0.30,
-                'stocks': 0.40,
-            }
-        else:  # transition
-            return {
-                'fixed_income': 0.40,
-                'fiis': 0.25,
-                'stocks': 0.35,
-            }
-    
+        pct = self.MEGA_PCT.get(regime, self.MEGA_PCT['transition'])
+        return dict(zip(self.MEGA_ORDER, pct.tolist()))
+
     def allocate_meso_layer(self, regime: str, regime_strength: float) -> Dict[str, float]:
         """Aloca camada MESO: setores econômicos.
-        
+
         Returns:
             Pesos para cada setor
         """
         return self.allocate_by_regime(regime, regime_strength)
+
+    def allocate_mega_meso(self, regime: str, regime_strength: float) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Camadas MEGA e MESO fundidas em uma única passada numérica.
+
+        Evita o ciclo duplo de montar/desmontar dicts entre as duas camadas:
+        o vetor de pesos base e a tabela MEGA já estão em cache, então uma
+        decisão custa uma chamada do kernel e duas construções de dict.
+
+        Returns:
+            (pesos mega, pesos por setor)
+        """
+        mega_pct = self.MEGA_PCT.get(regime, self.MEGA_PCT['transition'])
+        adjusted = _scale_and_normalize(
+            self._base_w, self._regime_multipliers(regime, regime_strength))
+        return (dict(zip(self.MEGA_ORDER, mega_pct.tolist())),
+                dict(zip(self.SECTOR_ORDER, adjusted.tolist())))
     
     def allocate_micro_layer(self, regime: str, 
                             meso_weights: Dict[str, float],
@@ -7,9 +7,14 @@ from dataclasses import dataclass
 from typing import Dict
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PortfolioProfile:
-    """Portfolio allocation profile with risk weights and constraints"""
+    """Portfolio allocation profile with risk weights and constraints
+
+    Frozen and slotted: profiles are shared read-only across orchestrators,
+    and slots make the frequent attribute reads in the allocation hot path
+    a fixed-offset lookup instead of a __dict__ probe.
+    """
     name: str
     risk_level: int  # 1-3 (Conservative, Intermediate, Aggressive)
     
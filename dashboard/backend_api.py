@@ -1,10 +1,9 @@
 """FastAPI Backend for Dashboard - Integrates with Quantitative Investment Algorithm"""
 from fastapi import FastAPI, WebSocket, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import json
 import asyncio
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Optional
 import sys
 import os
@@ -159,9 +158,16 @@ def mock_portfolio_data() -> Dict:
     }
 
 
+_MOCK_TRADES: List[Dict] = []
+
+
 def mock_trades_data() -> List[Dict]:
+    # Built once per process: every /api/trades request was rebuilding the
+    # same 10 dicts plus the datetime arithmetic for their timestamps
+    if _MOCK_TRADES:
+        return _MOCK_TRADES
     base_date = datetime.now() - timedelta(days=90)
-    trades = []
+    trades = _MOCK_TRADES
     for i in range(10):
         trade_date = base_date + timedelta(days=i*9)
         trades.append({
@@ -181,36 +187,46 @@ def mock_trades_data() -> List[Dict]:
     return trades
 
 
-def mock_positions_data() -> List[Dict]:
-    return [
-        {"asset": "LCI/LCA", "quantity": 10000, "price": 1.0, "total": 10000, "pct": 20.7},
-        {"asset": "FII", "quantity": 500, "price": 100, "total": 50000, "pct": 20.7},
-        {"asset": "VALE3", "quantity": 100, "price": 65, "total": 6500, "pct": 13.5},
-        {"asset": "TECH ETF", "quantity": 250, "price": 45, "total": 11250, "pct": 23.3},
-        {"asset": "CRYPTO (BTC)", "quantity": 0.05, "price": 35000, "total": 1750, "pct": 3.6},
-    ]
+# Static read-only mock payloads, frozen at module load: one shared
+# instance per process instead of rebuilding the structures per request
+_MOCK_POSITIONS = (
+    MappingProxyType({"asset": "LCI/LCA", "quantity": 10000, "price": 1.0, "total": 10000, "pct": 20.7}),
+    MappingProxyType({"asset": "FII", "quantity": 500, "price": 100, "total": 50000, "pct": 20.7}),
+    MappingProxyType({"asset": "VALE3", "quantity": 100, "price": 65, "total": 6500, "pct": 13.5}),
+    MappingProxyType({"asset": "TECH ETF", "quantity": 250, "price": 45, "total": 11250, "pct": 23.3}),
+    MappingProxyType({"asset": "CRYPTO (BTC)", "quantity": 0.05, "price": 35000, "total": 1750, "pct": 3.6}),
+)
+
+_MOCK_PERFORMANCE = MappingProxyType({
+    "sharpe_ratio": 1.85,
+    "sortino_ratio": 2.45,
+    "calmar_ratio": 1.5,
+    "var_95": -2.1,
+    "max_drawdown": -8.3,
+    "annual_return": 15.2,
+    "volatility": 8.2,
+})
+
+
+def mock_positions_data() -> tuple:
+    return _MOCK_POSITIONS
 
 
 def mock_indicators_data() -> Dict:
+    # One timestamp per response instead of five datetime.now().isoformat()
+    # materializations - the indicators share the same snapshot time anyway
+    now = datetime.now().isoformat()
     return {
-        "selic": {"value": 10.5, "change": 0.5, "date": datetime.now().isoformat()},
-        "ipca": {"value": 4.2, "change": -0.1, "date": datetime.now().isoformat()},
-        "pib": {"value": 2.1, "change": 0.3, "date": datetime.now().isoformat()},
-        "usd_brl": {"value": 5.15, "change": 0.02, "date": datetime.now().isoformat()},
-        "vix": {"value": 16.5, "change": -1.2, "date": datetime.now().isoformat()},
+        "selic": {"value": 10.5, "change": 0.5, "date": now},
+        "ipca": {"value": 4.2, "change": -0.1, "date": now},
+        "pib": {"value": 2.1, "change": 0.3, "date": now},
+        "usd_brl": {"value": 5.15, "change": 0.02, "date": now},
+        "vix": {"value": 16.5, "change": -1.2, "date": now},
     }
 
 
 def mock_performance_data() -> Dict:
-    return {
-        "sharpe_ratio": 1.85,
-        "sortino_ratio": 2.45,
-        "calmar_ratio": 1.5,
-        "var_95": -2.1,
-        "max_drawdown": -8.3,
-        "annual_return": 15.2,
-        "volatility": 8.2,
-    }
+    return _MOCK_PERFORMANCE
 
 
 if __name__ == "__main__":
@@ -1,7 +1,6 @@
 import requests
 import pandas as pd
-import numpy as np
-from typing import Optional, List, Dict
+from typing import List, Dict
 from datetime import datetime
 
 class BCBClient:
@@ -124,17 +123,14 @@ if __name__ == "__main__":
     # Teste rápido
     bcb = BCBClient()
     
-    print("
-=== TESTE: Indicadores Macro BR ===")
+    print("\n=== TESTE: Indicadores Macro BR ===")
     indicadores = bcb.fetch_indicators(['SELIC', 'IPCA', 'IBC_BR'], start_date='2023-01-01')
     print(indicadores.tail())
-    
-    print(f"
-SELIC Atual: {bcb.get_latest_selic()}%")
-    
+
+    print(f"\nSELIC Atual: {bcb.get_latest_selic()}%")
+
     inflacao = bcb.get_latest_inflation()
     print(f"IPCA (último mês): {inflacao['IPCA']}% ({inflacao['date_ipca']})")
     print(f"IGP-M (último mês): {inflacao['IGPM']}% ({inflacao['date_igpm']})")
-    
-    print("
-✅ Cliente BCB testado com sucesso!")
+
+    print("\n✅ Cliente BCB testado com sucesso!")
@@ -1,6 +1,5 @@
 import requests
 import pandas as pd
-import numpy as np
 from typing import List, Optional, Dict, Union
 from datetime import datetime, timedelta
 import warnings
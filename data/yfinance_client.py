@@ -1,6 +1,5 @@
 import yfinance as yf
 import pandas as pd
-import numpy as np
 from typing import List, Optional, Dict, Union
 from datetime import datetime, timedelta
 import warnings
@@ -250,19 +249,33 @@ class MarketDataClient:
                                     tickers: List[str],
                                     start_date: str = '2020-01-01') -> pd.DataFrame:
         """Busca múltiplos tickers com fallback individual em caso de erro.
-        
+
         Útil quando alguns tickers podem estar incorretos ou indisponíveis.
-        
+        Primeiro tenta baixar todos em uma única chamada HTTP (yf.download
+        aceita múltiplos tickers) e só cai para requisições individuais
+        para os tickers que faltarem no lote.
+
         Args:
             tickers: Lista de tickers
             start_date: Data inicial
-            
+
         Returns:
             DataFrame com dados disponíveis
         """
         successful_data = {}
-        
-        for ticker in tickers:
+
+        # Lote único: 1 round-trip para N tickers
+        try:
+            batch = self.fetch_daily_data(tickers, start_date)
+            for ticker in tickers:
+                if ticker in batch.columns and batch[ticker].notna().any():
+                    successful_data[ticker] = batch[ticker]
+        except Exception as e:
+            print(f"[YFinance] Falha no download em lote: {e}")
+
+        # Fallback individual apenas para o que faltou
+        missing = [t for t in tickers if t not in successful_data]
+        for ticker in missing:
             try:
                 data = self.fetch_daily_data(ticker, start_date)
                 if len(data) > 0:
@@ -270,7 +283,7 @@ class MarketDataClient:
             except Exception as e:
                 print(f"[YFinance] Falha ao buscar {ticker}: {e}")
                 continue
-        
+
         if successful_data:
             return pd.DataFrame(successful_data)
         return pd.DataFrame()
@@ -8,7 +8,7 @@ Usage:
     python main.py  # avaliacao unica com perfil padrao
 """
 import sys
-import os
+import asyncio
 import logging
 import argparse
 from pathlib import Path
@@ -50,17 +50,17 @@ def main():
     if args.auto:
         # Modo Agente Automatico - sem interferencia humana
         logger.info(f"Iniciando MODO AUTONOMO com perfil: {args.profile}")
-        orch.run_agent(amount=args.aporte)
+        asyncio.run(orch.run_agent(amount=args.aporte))
     else:
         # Avaliacao unica
         logger.info("Executando avaliacao unica...")
         decision = orch.process_aporte(amount=args.aporte)
         print("\n" + "=" * 50)
-        print(f"Data: {decision['date']}")
-        print(f"Regime: {decision['regime']}")
-        print(f"Justificativa: {decision['justification']}")
+        print(f"Data: {decision.date}")
+        print(f"Regime: {decision.regime}")
+        print(f"Justificativa: {decision.justification}")
         print("\nAlocacao recomendada:")
-        for asset, value in decision['allocation'].items():
+        for asset, value in decision.allocation.items():
             print(f"  {asset}: R$ {value:,.2f}")
         print("=" * 50 + "\n")
 
@@ -2,8 +2,11 @@
 Portfolio Orchestrator - Core
 Coordinates real-time data collection, regime detection, and sector allocation.
 """
+import asyncio
+import heapq
 import logging
-import time
+import operator
+import signal
 from datetime import datetime
 from typing import Dict, List, Optional
 import pandas as pd
@@ -14,9 +17,61 @@ from data.bcb_client import BCBClient
 from data.fred_client import FREDClient
 from data.yfinance_client import MarketDataClient
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:  # pyarrow é opcional - agente cai para export CSV
+    _HAS_PYARROW = False
+
+# Configura logging apenas se o app (main.py/app.py) ainda não configurou
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
+# Template único da justificativa - compartilhado por todas as decisões
+_JUSTIFICATION_FMT = (
+    "Regime {regime} (forca {strength:.2f}) detectado. "
+    "SELIC={selic:.1f}%, IPCA={ipca:.2f}%, Fed={fed_funds:.2f}%. "
+    "Setores em destaque: {sectors}."
+)
+
+
+class AllocationDecision:
+    """Single allocation decision kept in the orchestrator's decision_log.
+
+    Uses __slots__ so long-running agents holding thousands of decisions
+    pay one fixed-size record per aporte instead of a per-instance __dict__.
+    """
+
+    __slots__ = ('date', 'regime', 'strength', 'macro', 'mega_allocation',
+                 'sector_weights', 'allocation', 'justification')
+
+    def __init__(self, date: str, regime: str, strength: float, macro: Dict,
+                 mega_allocation: Dict[str, float], sector_weights: Dict[str, float],
+                 allocation: Dict[str, float], justification: str):
+        self.date = date
+        self.regime = regime
+        self.strength = strength
+        self.macro = macro
+        self.mega_allocation = mega_allocation
+        self.sector_weights = sector_weights
+        self.allocation = allocation
+        self.justification = justification
+
+    def to_dict(self) -> Dict:
+        """Convert the decision to a plain dict (CSV export / API)."""
+        return {
+            'date': self.date,
+            'regime': self.regime,
+            'strength': self.strength,
+            'macro': self.macro,
+            'mega_allocation': self.mega_allocation,
+            'sector_weights': self.sector_weights,
+            'allocation': self.allocation,
+            'justification': self.justification,
+        }
+
 
 class PortfolioOrchestrator:
     def __init__(self, profile_name: str = "intermediate"):
@@ -26,7 +81,12 @@ class PortfolioOrchestrator:
         self.bcb = BCBClient()
         self.fred = FREDClient()
         self.market = MarketDataClient()
-        self.decision_log: List[Dict] = []
+        self.decision_log: List[AllocationDecision] = []
+        self._parquet_writer = None
+        # Frações BR/US do bloco de ações são fixas por perfil - calcula uma vez
+        br_us_denom = self.profile.br_stocks_pct + self.profile.us_stocks_pct + 0.001
+        self._br_share = self.profile.br_stocks_pct / br_us_denom
+        self._us_share = self.profile.us_stocks_pct / br_us_denom
         logger.info(f"Orchestrator initialized: {profile_name}")
 
     def fetch_macro_data(self) -> Dict:
@@ -42,10 +102,13 @@ class PortfolioOrchestrator:
             'fed_funds': fed_funds,
         }
 
-    def fetch_price_history(self, ticker: str = '^BVSP', period_days: int = 250) -> pd.DataFrame:
+    def fetch_price_history(self, ticker: str = '^BVSP', period_days: int = 250,
+                            now: Optional[datetime] = None) -> pd.DataFrame:
         """Fetch historical price data for regime detection."""
         from datetime import timedelta
-        start = (datetime.now() - timedelta(days=period_days)).strftime('%Y-%m-%d')
+        if now is None:
+            now = datetime.now()
+        start = (now - timedelta(days=period_days)).strftime('%Y-%m-%d')
         df = self.market.fetch_daily_data(ticker, start_date=start)
         if df.empty:
             return pd.DataFrame()
@@ -53,10 +116,13 @@ class PortfolioOrchestrator:
         df.columns = ['close']
         return df
 
-    def process_aporte(self, amount: float) -> Dict:
+    def process_aporte(self, amount: float) -> AllocationDecision:
         """Single entry point for generating allocation decisions."""
+        # Timestamp único por decisão - evita chamadas repetidas a datetime.now()
+        now = datetime.now()
+
         # Fetch price history for regime detection
-        price_data = self.fetch_price_history('^BVSP')
+        price_data = self.fetch_price_history('^BVSP', now=now)
         macro = self.fetch_macro_data()
 
         # Detect market regime
@@ -64,56 +130,134 @@ class PortfolioOrchestrator:
             logger.warning("Insufficient price data - defaulting to TRANSITION regime")
             regime_result = {'regime': 'transition', 'strength': 0.5}
         else:
-            macro_df = pd.DataFrame([macro])
-            regime_result = self.regime_detector.detect_regime(price_data, macro_data=macro_df)
+            # detect_regime aceita o dict direto - sem DataFrame intermediário
+            regime_result = self.regime_detector.detect_regime(price_data, macro_data=macro)
 
         regime = regime_result['regime']
         strength = regime_result.get('strength', 0.5)
 
-        # Mega layer allocation (RF, FIIs, Stocks)
-        mega = self.sector_allocator.allocate_mega_layer(regime, strength)
-
-        # Meso layer allocation (sectors)
-        meso = self.sector_allocator.allocate_meso_layer(regime, strength)
+        # Camadas MEGA (RF, FIIs, Ações) e MESO (setores) em uma passada
+        mega, meso = self.sector_allocator.allocate_mega_meso(regime, strength)
 
         # Build value allocation
         allocation = {
             'fixed_income': mega['fixed_income'] * amount,
             'fiis': mega['fiis'] * amount,
-            'stocks_br': mega['stocks'] * self.profile.br_stocks_pct / (
-                self.profile.br_stocks_pct + self.profile.us_stocks_pct + 0.001) * amount,
-            'stocks_us': mega['stocks'] * self.profile.us_stocks_pct / (
-                self.profile.br_stocks_pct + self.profile.us_stocks_pct + 0.001) * amount,
+            'stocks_br': mega['stocks'] * self._br_share * amount,
+            'stocks_us': mega['stocks'] * self._us_share * amount,
         }
 
-        decision = {
-            'date': datetime.now().isoformat(),
-            'regime': regime,
-            'strength': round(strength, 3),
-            'macro': macro,
-            'mega_allocation': mega,
-            'sector_weights': meso,
-            'allocation': allocation,
-            'justification': (
-                f"Regime {regime} (forca {strength:.2f}) detectado. "
-                f"SELIC={macro['selic']:.1f}%, IPCA={macro['ipca']:.2f}%, "
-                f"Fed={macro['fed_funds']:.2f}%."
-            ),
-        }
+        decision = AllocationDecision(
+            date=now.isoformat(),
+            regime=regime,
+            strength=round(strength, 3),
+            macro=macro,
+            mega_allocation=mega,
+            sector_weights=meso,
+            allocation=allocation,
+            justification=self._generate_justification(regime, strength, macro, meso),
+        )
         self.decision_log.append(decision)
         return decision
 
-    def run_agent(self, amount: float = 5000.0):
-        """Autonomous execution loop - runs every 24h without human intervention."""
+    def _generate_justification(self, regime: str, strength: float,
+                                macro: Dict, sector_weights: Dict[str, float]) -> str:
+        """Build the human-readable rationale attached to each decision."""
+        # heapq.nlargest + itemgetter: top-k em O(S) sem ordenar todos os setores
+        top_sectors = heapq.nlargest(3, sector_weights.items(), key=operator.itemgetter(1))
+        sectors_txt = ", ".join(f"{name} ({weight:.0%})" for name, weight in top_sectors)
+        return _JUSTIFICATION_FMT.format_map({
+            'regime': regime,
+            'strength': strength,
+            'selic': macro['selic'],
+            'ipca': macro['ipca'],
+            'fed_funds': macro['fed_funds'],
+            'sectors': sectors_txt,
+        })
+
+    def get_decision_history(self) -> List[AllocationDecision]:
+        """Return all decisions taken so far (most recent last)."""
+        return self.decision_log
+
+    def get_current_regime(self) -> Dict:
+        """Return the last detected regime and its strength."""
+        return {
+            'regime': self.regime_detector.current_regime or RegimeDetection.TRANSITION,
+            'strength': self.regime_detector.regime_strength,
+        }
+
+    def get_portfolio_summary(self) -> Dict:
+        """Summarize the latest allocation decision for the dashboard."""
+        if not self.decision_log:
+            return {
+                'profile': self.profile.name,
+                'decisions': 0,
+                'last_decision': None,
+            }
+        last = self.decision_log[-1]
+        return {
+            'profile': self.profile.name,
+            'decisions': len(self.decision_log),
+            'last_decision': last.to_dict(),
+        }
+
+    def export_decisions(self, path: str = "decisions.csv"):
+        """Persist the decision log to disk as CSV (human-readable export)."""
+        pd.DataFrame([d.to_dict() for d in self.decision_log]).to_csv(path, index=False)
+
+    def _append_decision_parquet(self, decision: AllocationDecision,
+                                 path: str = "decisions.parquet"):
+        """Append a single decision to the columnar Parquet log.
+
+        Unlike the CSV export, this is an O(1) append: the ParquetWriter is
+        opened once and each decision becomes one RecordBatch, instead of
+        reserializing the whole history every cycle.
+        """
+        batch = pa.RecordBatch.from_pylist([decision.to_dict()])
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(path, batch.schema)
+        self._parquet_writer.write_batch(batch)
+
+    def _close_parquet(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    async def run_agent(self, amount: float = 5000.0):
+        """Autonomous execution loop - runs every 24h without human intervention.
+
+        Async so the 24h wait shares the event loop (multiple profile agents
+        can run in one process) and SIGTERM/SIGINT interrupt it immediately
+        instead of waiting out a blocking time.sleep().
+        """
         logger.info("AGENT STARTING - FULL AUTONOMY")
-        while True:
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows: sem add_signal_handler
+                pass
+
+        while not stop.is_set():
             try:
                 res = self.process_aporte(amount)
-                logger.info(f"DECISION: {res['justification']}")
-                pd.DataFrame(self.decision_log).to_csv("decisions.csv", index=False)
+                logger.info(f"DECISION: {res.justification}")
+                if _HAS_PYARROW:
+                    self._append_decision_parquet(res)
+                else:
+                    self.export_decisions()
             except Exception as e:
                 logger.error(f"Agent Error: {e}")
-            time.sleep(86400)  # 24h interval
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=86400)  # 24h interval
+            except asyncio.TimeoutError:
+                pass
+
+        # Shutdown limpo: garante o log de decisões em disco
+        self._close_parquet()
+        self.export_decisions()
+        logger.info("Agent stopped - decision log flushed.")
 
 
 # Alias for backward compatibility